@@ -0,0 +1,26 @@
+"""
+Gunicorn config for the Docker image.
+
+The app is imported and warmed once in the master, then workers are
+forked from it, so they share the loaded nlpo3 dictionary and PyThaiNLP
+data copy-on-write instead of each building its own copy. Worker count
+comes from WEB_CONCURRENCY (read by gunicorn itself).
+"""
+
+import gc
+
+bind = "0.0.0.0:8000"
+worker_class = "uvicorn_worker.UvicornWorker"
+preload_app = True
+# Request log to stdout, as the uvicorn CLI did (gunicorn's default is off)
+accesslog = "-"
+
+
+def when_ready(server):
+    # Runs in the master after the app is imported, before any worker forks
+    import main
+
+    main._warm_up()
+    # Keep the cyclic GC in workers from touching (and un-sharing) the
+    # pages holding everything loaded so far
+    gc.freeze()
@@ -2,6 +2,7 @@
 import time
 from pathlib import Path
 
+import pytest
 from fastapi.testclient import TestClient
 
 sys.path.append(str(Path(__file__).resolve().parents[1]))
@@ -11,6 +12,12 @@ import main
 client = TestClient(main.app)
 
 
+@pytest.fixture(autouse=True)
+def clear_caches():
+    main._cached_tokenize.cache_clear()
+    main._cached_normalize.cache_clear()
+
+
 def test_health_endpoint():
     resp = client.get('/health')
     assert resp.status_code == 200
@@ -20,6 +27,40 @@ def test_health_endpoint():
     assert data['uptime_seconds'] >= 0
 
 
+def test_startup_warms_lazy_modules(monkeypatch):
+    warmed = []
+
+    def loader(name):
+        def get():
+            warmed.append(name)
+            return lambda *args, **kwargs: []
+        return get
+
+    monkeypatch.setattr(main, 'get_tokenize', loader('tokenize'))
+    monkeypatch.setattr(main, 'get_normalize', loader('normalize'))
+    monkeypatch.setattr(main, 'get_sent_tokenize', loader('sent_tokenize'))
+    monkeypatch.setattr(main, 'get_stopwords', lambda: warmed.append('stopwords'))
+
+    def broken_correct():
+        raise RuntimeError('boom')
+
+    monkeypatch.setattr(main, 'get_correct', broken_correct)
+
+    with TestClient(main.app) as warm_client:
+        assert warm_client.get('/health').status_code == 200
+
+    assert warmed == ['tokenize', 'normalize', 'sent_tokenize', 'stopwords']
+
+
+def test_oversized_body_rejected_before_parsing(monkeypatch):
+    monkeypatch.setattr(main, 'MAX_BODY_BYTES', 64)
+    resp = client.post('/chunk', json={'text': 'ก' * 100})
+    assert resp.status_code == 413
+
+    resp = client.post('/tokenize', json={'text': 'ก'})
+    assert resp.status_code == 200
+
+
 def test_tokenize_returns_tokens_and_segmented():
     resp = client.post('/tokenize', json={'text': 'อยากกินข้าวผัดกุ้ง'})
     assert resp.status_code == 200
@@ -43,6 +84,116 @@ def test_tokenize_graceful_fallback(monkeypatch):
     assert isinstance(data['tokens'], list)
 
 
+def test_tokenize_runs_on_worker_pool(monkeypatch):
+    import threading
+
+    seen = []
+
+    def recording_tokenizer(text, engine='newmm', keep_whitespace=True):
+        seen.append(threading.current_thread().name)
+        return text.split()
+
+    monkeypatch.setattr(main, 'get_tokenize', lambda: recording_tokenizer)
+    resp = client.post('/tokenize', json={'text': 'ทดสอบ ระบบ'})
+    assert resp.status_code == 200
+    assert resp.json()['tokens'] == ['ทดสอบ', 'ระบบ']
+    assert seen and seen[0].startswith('nlp')
+
+
+def test_tokenize_coalesces_concurrent_requests(monkeypatch):
+    import asyncio
+
+    batches = []
+
+    def recording_many(texts, engine):
+        batches.append(list(texts))
+        return [text.split() for text in texts]
+
+    monkeypatch.setattr(main, '_tokenize_many', recording_many)
+
+    async def run():
+        reqs = [main.TokenizeRequest(text=f'คำ {i}') for i in range(5)]
+        return await asyncio.gather(*(main.tokenize(r) for r in reqs))
+
+    responses = asyncio.run(run())
+    assert batches == [[f'คำ {i}' for i in range(5)]]
+    assert [r.tokens for r in responses] == [['คำ', str(i)] for i in range(5)]
+
+
+def test_tokenize_bad_input_only_fails_its_own_request(monkeypatch):
+    import asyncio
+
+    def picky_many(texts, engine):
+        if 'bad' in texts:
+            raise RuntimeError('boom')
+        return [text.split() for text in texts]
+
+    monkeypatch.setattr(main, '_tokenize_many', picky_many)
+
+    async def run():
+        reqs = [main.TokenizeRequest(text=t) for t in ('ก ข', 'bad', 'ค')]
+        return await asyncio.gather(*(main.tokenize(r) for r in reqs))
+
+    good1, bad, good2 = asyncio.run(run())
+    assert (good1.engine, good1.tokens) == ('newmm', ['ก', 'ข'])
+    assert bad.engine == 'fallback'
+    assert (good2.engine, good2.tokens) == ('newmm', ['ค'])
+
+
+def test_tokenize_batch_matches_single_requests():
+    texts = ['อยากกินข้าวผัดกุ้ง', 'ไม่ได้ไปนะจ๊ะ แต่คิดถึงมากๆ']
+    resp = client.post('/tokenize/batch', json={'inputs': texts})
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data['engine'] == 'newmm'
+    assert len(data['results']) == len(texts)
+    for text, tokens in zip(texts, data['results']):
+        single = client.post('/tokenize', json={'text': text}).json()
+        assert tokens == single['tokens']
+
+
+def test_tokenize_batch_validates_each_input():
+    resp = client.post('/tokenize/batch', json={'inputs': ['ทดสอบ', '']})
+    assert resp.status_code == 422
+
+    resp = client.post('/tokenize/batch', json={'inputs': ['ทดสอบ', 'ก' * 100_001]})
+    assert resp.status_code == 422
+
+
+def test_tokenize_batch_graceful_fallback(monkeypatch):
+    def broken_tokenizer():
+        raise RuntimeError('boom')
+
+    monkeypatch.setattr(main, 'get_tokenize', broken_tokenizer)
+    resp = client.post('/tokenize/batch', json={'inputs': ['ทดสอบ ระบบ', 'abc']})
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data['engine'] == 'fallback'
+    assert data['results'] == [['ทดสอบ', 'ระบบ'], ['abc']]
+
+
+def test_tokenize_repeated_text_hits_cache():
+    text = 'อยากกินข้าวผัดกุ้ง'
+    first = client.post('/tokenize', json={'text': text}).json()
+    second = client.post('/tokenize', json={'text': text}).json()
+    assert first['tokens'] == second['tokens']
+
+    resp = client.get('/cache/stats')
+    assert resp.status_code == 200
+    stats = resp.json()
+    assert stats['tokenize']['hits'] >= 1
+    assert stats['tokenize']['currsize'] >= 1
+    assert set(stats['normalize']) == {'hits', 'misses', 'maxsize', 'currsize'}
+
+
+def test_long_text_bypasses_cache():
+    long_text = 'สวัสดี' * (main.NLP_CACHE_MAX_TEXT // 6 + 1)
+    assert len(long_text) > main.NLP_CACHE_MAX_TEXT
+    resp = client.post('/tokenize', json={'text': long_text})
+    assert resp.status_code == 200
+    assert main._cached_tokenize.cache_info().currsize == 0
+
+
 def test_chunk_returns_consistent_count():
     text = 'ประโยคที่หนึ่ง ประโยคที่สอง ประโยคที่สาม'
     resp = client.post('/chunk', json={'text': text, 'max_tokens': 50, 'overlap': 10})
@@ -52,6 +203,54 @@ def test_chunk_returns_consistent_count():
     assert data['count'] >= 1
 
 
+def test_chunk_stream_matches_chunk(monkeypatch):
+    import json
+
+    sentences = [f's{i} ' + 'คำ ' * 9 for i in range(8)]
+    monkeypatch.setattr(main, 'get_sent_tokenize', lambda: (lambda _text: sentences))
+    payload = {'text': 'x', 'max_tokens': 50, 'overlap': 20}
+
+    expected = client.post('/chunk', json=payload).json()['chunks']
+    resp = client.post('/chunk/stream', json=payload)
+    assert resp.status_code == 200
+    assert resp.headers['content-type'].startswith('application/x-ndjson')
+    lines = [json.loads(line) for line in resp.text.splitlines()]
+    assert [line['idx'] for line in lines] == list(range(len(expected)))
+    assert [line['chunk'] for line in lines] == expected
+
+
+def test_chunk_stream_graceful_fallback(monkeypatch):
+    import json
+
+    def broken_sent_tokenize():
+        raise RuntimeError('boom')
+
+    monkeypatch.setattr(main, 'get_sent_tokenize', broken_sent_tokenize)
+    resp = client.post('/chunk/stream', json={'text': 'ทดสอบ fallback', 'max_tokens': 80})
+    assert resp.status_code == 200
+    assert [json.loads(line) for line in resp.text.splitlines()] == [{'chunk': 'ทดสอบ fallback', 'idx': 0}]
+
+
+def test_chunk_stream_reports_mid_stream_failure(monkeypatch):
+    import json
+
+    def failing_tokenizer(text, engine='newmm', keep_whitespace=True):
+        if 'boom' in text:
+            raise RuntimeError('tokenizer crashed')
+        return text.split()
+
+    sentences = [f's{i} ' + 'คำ ' * 9 for i in range(6)] + ['boom']
+    monkeypatch.setattr(main, 'get_tokenize', lambda: failing_tokenizer)
+    monkeypatch.setattr(main, 'get_sent_tokenize', lambda: (lambda _text: sentences))
+
+    resp = client.post('/chunk/stream', json={'text': 'x', 'max_tokens': 50, 'overlap': 0})
+    assert resp.status_code == 200
+    lines = [json.loads(line) for line in resp.text.splitlines()]
+    assert len(lines) == 2
+    assert lines[0]['idx'] == 0 and lines[0]['chunk'].startswith('s0 ')
+    assert lines[1] == {'error': 'tokenizer crashed', 'idx': 1}
+
+
 def test_stopwords_filters_expected_tokens():
     resp = client.post('/stopwords', json={'tokens': ['ฉัน', 'และ', 'คุณ']})
     assert resp.status_code == 200
@@ -70,6 +269,15 @@ def test_tokenize_handles_thai_tone_marks_and_spacing():
     assert 'ได้' in data['segmented']
 
 
+def test_tokenize_drops_whitespace_only_tokens():
+    resp = client.post('/tokenize', json={'text': 'สวัสดี\nครับ  \t โลก'})
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data['tokens']
+    assert all(t.strip() for t in data['tokens'])
+    assert data['segmented'] == ' '.join(data['tokens'])
+
+
 def test_tokenize_handles_mixed_emoji_and_thai_compound():
     text = 'อยากกินข้าวผัดกุ้ง🍤กับเพื่อน555'
     resp = client.post('/tokenize', json={'text': text})
@@ -108,6 +316,21 @@ def test_spellcheck_endpoint_returns_payload():
     assert isinstance(data['changed'], bool)
 
 
+def test_spellcheck_only_corrects_thai_tokens(monkeypatch):
+    checked = []
+
+    def recording_correct(word):
+        checked.append(word)
+        return word
+
+    monkeypatch.setattr(main, 'get_correct', lambda: recording_correct)
+    resp = client.post('/spellcheck', json={'text': 'hello ทดสอบ 123'})
+    assert resp.status_code == 200
+    assert resp.json()['corrected'] == 'hello ทดสอบ 123'
+    assert checked and all(main._THAI_RE.search(w) for w in checked)
+    assert 'hello' not in checked and '123' not in checked
+
+
 def test_spellcheck_graceful_fallback(monkeypatch):
     def broken_correct(_text: str):
         raise RuntimeError('boom')
@@ -133,6 +356,26 @@ def test_chunk_handles_long_thai_text_over_1000_chars():
     assert all(chunk.strip() for chunk in data['chunks'])
 
 
+def test_chunk_tokenizes_each_sentence_once(monkeypatch):
+    calls = []
+
+    def counting_tokenizer(text, engine='newmm', keep_whitespace=True):
+        calls.append(text)
+        return text.split()
+
+    sentences = [f's{i} ' + 'คำ ' * 9 for i in range(8)]
+    monkeypatch.setattr(main, 'get_tokenize', lambda: counting_tokenizer)
+    monkeypatch.setattr(main, 'get_sent_tokenize', lambda: (lambda _text: sentences))
+
+    resp = client.post('/chunk', json={'text': 'x', 'max_tokens': 50, 'overlap': 20})
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data['count'] == 2
+    assert data['chunks'][1].startswith('s3 ')
+    assert len(calls) == len(sentences)
+    assert main._cached_tokenize.cache_info().currsize == 0
+
+
 def test_chunk_handles_empty_sentence_list(monkeypatch):
     monkeypatch.setattr(main, 'get_sent_tokenize', lambda: (lambda _text: []))
     text = 'ข้อความยาวที่อยากลองแบ่ง'
@@ -156,6 +399,27 @@ def test_chunk_graceful_fallback(monkeypatch):
     assert data['chunks'][0] == text
 
 
+def test_stopwords_preserves_token_order():
+    tokens = ['ฉัน', 'และ', 'คุณ', 'และ', 'ข้าว']
+    resp = client.post('/stopwords', json={'tokens': tokens})
+    assert resp.status_code == 200
+    data = resp.json()
+    sw = main.get_stopwords()
+    assert data['filtered'] == [t for t in tokens if t not in sw]
+    assert data['removed'] == [t for t in tokens if t in sw]
+
+
+def test_stopwords_large_list_matches_small_path():
+    tokens = ['ฉัน', 'และ', 'คุณ', 'ข้าว'] * 2_000
+    assert len(tokens) >= main.STOPWORDS_POOL_MIN_TOKENS
+    resp = client.post('/stopwords', json={'tokens': tokens})
+    assert resp.status_code == 200
+    data = resp.json()
+    small = client.post('/stopwords', json={'tokens': tokens[:4]}).json()
+    assert data['filtered'] == small['filtered'] * 2_000
+    assert data['removed'] == small['removed'] * 2_000
+
+
 def test_stopwords_graceful_fallback(monkeypatch):
     def broken_stopwords():
         raise RuntimeError('boom')
@@ -178,3 +442,29 @@ def test_tokenize_latency_is_reasonable_for_long_input():
     data = resp.json()
     assert data['elapsed_ms'] < 2000
     assert wall_ms < 3000
+
+
+@pytest.mark.parametrize('text', [
+    'ไม่ได้ไปนะจ๊ะ แต่คิดถึงมากๆ',
+    'เวลา 12:30 น.',
+    'ราคา 1,234.50 บาท ส่วนลด 10.5 เปอร์เซ็นต์',
+    'IP คือ 127.0.0.1 ครับ',
+    'วันที่ 12/03/2567 ครบ ๑๒ ปี',
+    'ดูที่ https://example.com/a?b=1 นะ',
+    'โทร 02-123-4567\nhello world',
+    'อยากกินข้าวผัดกุ้ง🍤กับเพื่อน555',
+])
+@pytest.mark.parametrize('keep_whitespace', [False, True])
+def test_tokenize_newmm_matches_pythainlp_output(text, keep_whitespace):
+    from pythainlp.tokenize import word_tokenize
+
+    tokens = main.get_tokenize()(text, engine='newmm', keep_whitespace=keep_whitespace)
+    assert tokens == word_tokenize(text, engine='newmm', keep_whitespace=keep_whitespace)
+
+
+def test_tokenize_longest_engine_uses_pythainlp():
+    resp = client.post('/tokenize', json={'text': 'อยากกินข้าวผัดกุ้ง', 'engine': 'longest'})
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data['engine'] == 'longest'
+    assert len(data['tokens']) >= 2